@@ -3,6 +3,7 @@ from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from app.crawler import crawl
 from app.timeline import load_causal_events, to_timeline, choose_processed_path
+from app.causal_index import graph_id_for, graph_path_by_id, choose_graph_path, load_index
 import os, json
 import subprocess 
 from pathlib import Path # 🚨 NEW: Required for robust path handling
@@ -68,7 +69,69 @@ def generate_timeline(q: str = Query(..., min_length=3, description="Search topi
         return {"query": q, "timeline": [], "error": "⚠️ No structured causal events found."}
 
     # 5️⃣ Run Causal Graph Compression (NEW)
-    tl = to_timeline(causal_events)
+    graph_id = graph_id_for(latest_path)
+    tl = to_timeline(causal_events, graph_path=graph_path_by_id(graph_id))
     print(f"✅ Causal Timeline generated with {len(tl)} events.")
 
-    return {"query": q, "timeline": tl}
\ No newline at end of file
+    # `graph` identifies this timeline's causal graph for the /events queries
+    return {"query": q, "graph": graph_id, "timeline": tl}
+
+
+# --- Causal chain queries (served from the graph persisted by /timeline) ---
+
+def _load_graph(graph):
+    """
+    Index for the given graph id (as returned by /timeline), falling back to the
+    newest graph only when no id is passed. Returns (index, error).
+    """
+    if graph:
+        try:
+            path = graph_path_by_id(graph)
+        except ValueError as e:
+            return None, f"❌ {e}"
+        if not os.path.exists(path):
+            return None, f"❌ Unknown graph '{graph}'."
+    else:
+        path = choose_graph_path()
+        if not path:
+            return None, "❌ No causal graph yet — call /timeline first."
+    return load_index(path), None
+
+
+GRAPH_PARAM = Query(None, description="Graph id returned by /timeline (defaults to the latest graph)")
+
+
+@app.get("/events/chain")
+def event_chain(src: int = Query(..., alias="from"), dst: int = Query(..., alias="to"), graph: str = GRAPH_PARAM):
+    """Strongest causal path between two events of a timeline."""
+    idx, error = _load_graph(graph)
+    if error:
+        return {"error": error}
+    chain = idx.chain(src, dst)
+    if chain is None:
+        return {"from": src, "to": dst, "chain": [], "error": "⚠️ No causal path between these events."}
+    return {"from": src, "to": dst, "strength": chain["strength"], "chain": chain["events"]}
+
+
+@app.get("/events/{event_id}/causes")
+def event_causes(event_id: int, max_hops: int = Query(None, ge=1), graph: str = GRAPH_PARAM):
+    """What led to this event (multi-hop ancestors)."""
+    idx, error = _load_graph(graph)
+    if error:
+        return {"error": error}
+    causes = idx.causes(event_id, max_hops)
+    if causes is None:
+        return {"event_id": event_id, "causes": [], "error": "⚠️ Unknown event id."}
+    return {"event_id": event_id, "causes": causes}
+
+
+@app.get("/events/{event_id}/effects")
+def event_effects(event_id: int, max_hops: int = Query(None, ge=1), graph: str = GRAPH_PARAM):
+    """What this event led to (multi-hop descendants)."""
+    idx, error = _load_graph(graph)
+    if error:
+        return {"error": error}
+    effects = idx.effects(event_id, max_hops)
+    if effects is None:
+        return {"event_id": event_id, "effects": [], "error": "⚠️ Unknown event id."}
+    return {"event_id": event_id, "effects": effects}
\ No newline at end of file
@@ -0,0 +1,149 @@
+# app/causal_index.py
+import os
+import json
+import math
+import networkx as nx
+
+from app.storage import write_json
+
+# 🔗 Persisted causal graph + precomputed reachability for "what led to X?" queries.
+# Everything expensive (reachability, strongest paths) is done once at build
+# time; queries are plain dict lookups on the loaded JSON.
+
+GRAPH_DIR = "data/graph"
+
+_loaded = {}  # path -> (mtime, CausalIndex)
+
+
+def graph_id_for(processed_path: str) -> str:
+    """data/processed/causal_events_x.jsonl -> "causal_events_x" (the graph's file stem)."""
+    return os.path.splitext(os.path.basename(processed_path))[0]
+
+
+def graph_path_by_id(graph_id: str) -> str:
+    """Graph id -> data/graph/<id>.json; rejects anything path-like."""
+    if not graph_id or graph_id in (".", "..") or os.path.basename(graph_id) != graph_id:
+        raise ValueError(f"Invalid graph id '{graph_id}'")
+    return os.path.join(GRAPH_DIR, f"{graph_id}.json")
+
+
+def choose_graph_path():
+    """Newest persisted causal graph in data/graph/, or None."""
+    if not os.path.exists(GRAPH_DIR):
+        return None
+    files = [os.path.join(GRAPH_DIR, f) for f in os.listdir(GRAPH_DIR) if f.endswith(".json")]
+    return max(files, key=os.path.getmtime) if files else None
+
+
+def _cost(u, v, d):
+    # Strongest path = max product of weights = min sum of -log(weight)
+    return -math.log(max(d.get("weight", 0.5), 1e-9))
+
+
+def build_reachability(G: nx.DiGraph) -> dict:
+    """
+    Precompute, for every node, what it can reach and how:
+    - ancestors/descendants hold the hop distance (fewest edges, via BFS);
+    - paths hold the strongest path, whose strength is the product of the
+      CAUSAL_WEIGHTS on its edges. It may be longer than the hop distance.
+    The graph is not modified.
+    """
+    descendants = {n: {} for n in G.nodes}
+    ancestors = {n: {} for n in G.nodes}
+    paths = {}
+    for src in G.nodes:
+        for dst, h in nx.single_source_shortest_path_length(G, src).items():
+            if dst != src:
+                descendants[src][dst] = h
+                ancestors[dst][src] = h
+
+        dist, best = nx.single_source_dijkstra(G, src, weight=_cost)
+        for dst, p in best.items():
+            if dst != src:
+                paths[f"{src}->{dst}"] = {"path": p, "strength": round(math.exp(-dist[dst]), 4)}
+
+    return {
+        "nodes": {str(n): G.nodes[n].get("data", {}) for n in G.nodes},
+        "edges": [[u, v, d.get("weight", 0.5)] for u, v, d in G.edges(data=True)],
+        "ancestors": {str(n): {str(k): h for k, h in ancestors[n].items()} for n in G.nodes},
+        "descendants": {str(n): {str(k): h for k, h in descendants[n].items()} for n in G.nodes},
+        "paths": paths,
+    }
+
+
+def save_graph(G: nx.DiGraph, path: str):
+    write_json(path, build_reachability(G))
+    print(f"🔗 Saved causal graph with {G.number_of_nodes()} events -> {path}")
+
+
+class CausalIndex:
+    """Read-only query view over a graph persisted by save_graph()."""
+
+    def __init__(self, data: dict):
+        self.nodes = data["nodes"]
+        self.ancestors = data["ancestors"]
+        self.descendants = data["descendants"]
+        self.paths = data["paths"]
+
+    def _event(self, node_id, hops=None):
+        e = self.nodes[node_id]
+        out = {
+            "event_id": int(node_id),
+            "date": e.get("event_date", e.get("doc_date")),
+            "summary": e.get("milestone_summary"),
+            "url": e.get("source_url"),
+        }
+        if hops is not None:
+            out["hops"] = hops
+        return out
+
+    def _related(self, table, event_id, max_hops, path_key):
+        key = str(event_id)
+        if key not in self.nodes:
+            return None
+        out = []
+        for n, h in table[key].items():
+            if max_hops is not None and h > max_hops:
+                continue
+            best = self.paths[path_key(n, key)]
+            e = self._event(n, h)
+            e["strength"] = best["strength"]
+            e["path_hops"] = len(best["path"]) - 1  # length of the strongest path
+            out.append(e)
+        # Nearest first, strongest link first within the same hop count
+        return sorted(out, key=lambda e: (e["hops"], -e["strength"]))
+
+    def causes(self, event_id, max_hops=None):
+        """
+        Events that (transitively) led to `event_id`; None if the id is unknown.
+        `hops` is the fewest edges between the two events and is what `max_hops`
+        bounds; `strength`/`path_hops` describe the strongest path, which may be longer.
+        """
+        return self._related(self.ancestors, event_id, max_hops, lambda n, k: f"{n}->{k}")
+
+    def effects(self, event_id, max_hops=None):
+        """
+        Events that `event_id` (transitively) caused; None if the id is unknown.
+        `hops` is the fewest edges between the two events and is what `max_hops`
+        bounds; `strength`/`path_hops` describe the strongest path, which may be longer.
+        """
+        return self._related(self.descendants, event_id, max_hops, lambda n, k: f"{k}->{n}")
+
+    def chain(self, src, dst):
+        """Strongest causal path src -> dst as a list of events, or None if unreachable."""
+        p = self.paths.get(f"{src}->{dst}")
+        if not p:
+            return None
+        return {"strength": p["strength"], "events": [self._event(str(n)) for n in p["path"]]}
+
+
+def load_index(path: str) -> CausalIndex:
+    """Load (and memoise by mtime) a persisted causal graph."""
+    mtime = os.path.getmtime(path)
+    cached = _loaded.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, encoding="utf-8") as f:
+        idx = CausalIndex(json.load(f))
+    _loaded[path] = (mtime, idx)
+    return idx
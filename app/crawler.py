@@ -1,34 +1,62 @@
 # app/crawler.py
 from ddgs import DDGS
-import requests, json, os, time
+import json, os, time
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 
+try:
+    from app.http_cache import cached_get, cached_search, replay_window, OFFLINE
+    from app.prefilter import PageRejected
+except ImportError:
+    # Fallback for direct execution (e.g., python app/crawler.py)
+    from http_cache import cached_get, cached_search, replay_window, OFFLINE
+    from prefilter import PageRejected
+
 def to_naive(dt):
     if dt.tzinfo is not None:
         return dt.replace(tzinfo=None)
     return dt
 
-def crawl(query, start_date=None, end_date=None, n=40):
+def crawl(query, start_date=None, end_date=None, n=40, offline=None):
+    """
+    Search DDGS for `query` and save usable articles to data/raw/.
+    Searches and pages go through app/http_cache; `offline=True` (or
+    CRAWL_OFFLINE=1) replays a previous crawl purely from the cache.
+    Pages dropped by the pre-filter are logged with a reason in data/rejected/.
+    """
+    offline = OFFLINE if offline is None else offline
     os.makedirs("data/raw", exist_ok=True)
     out = []
+    rejected = []
+
+    region = "in-en"
 
     # 🕒 Auto-select the last 30 days if no range is given
-    if not start_date or not end_date:
+    # (an offline replay reuses the window of the newest cached search instead)
+    stored = replay_window(query, region) if offline and not (start_date and end_date) else None
+    if stored:
+        start_date = datetime.fromisoformat(stored[0])
+        end_date = datetime.fromisoformat(stored[1]) + timedelta(days=1, microseconds=-1)
+    elif not start_date or not end_date:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=30)
     else:
         start_date = to_naive(datetime.fromisoformat(start_date))
         end_date = to_naive(datetime.fromisoformat(end_date))
 
-    print(f"⏳ Searching '{query}' between {start_date.date()} and {end_date.date()}")
+    print(f"⏳ Searching '{query}' between {start_date.date()} and {end_date.date()}"
+          + (" (offline replay)" if offline else ""))
+
+    window = (start_date.date(), end_date.date())
 
     try:
         with DDGS() as ddgs:
-            results = list(ddgs.news(query, region="in-en", safesearch="Off"))
+            results = cached_search("news", lambda: ddgs.news(query, region=region, safesearch="Off"),
+                                    query, region, window, offline=offline)
             if not results:
                 print("⚠️ No direct news results — falling back to general web search.")
-                results = list(ddgs.text(query, region="in-en", safesearch="Off"))
+                results = cached_search("text", lambda: ddgs.text(query, region=region, safesearch="Off"),
+                                        query, region, window, offline=offline)
 
             for r in results:
                 if len(out) >= n:
@@ -52,10 +80,14 @@ def crawl(query, start_date=None, end_date=None, n=40):
                     continue
 
                 try:
-                    html = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10).text
+                    resp = cached_get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10, offline=offline)
+                    if resp is None:
+                        continue  # offline cache miss
+                    html = resp.text
                     soup = BeautifulSoup(html, "html.parser")
                     text = soup.get_text(" ", strip=True)
                     if len(text) < 400:
+                        rejected.append({"source_url": url, "reason": "short_text"})
                         continue
 
                     out.append({
@@ -63,8 +95,16 @@ def crawl(query, start_date=None, end_date=None, n=40):
                         "raw_html": html,
                         "date": article_date.strftime("%Y-%m-%d") if article_date else None
                     })
-                    print(f"✅ Fetched: {url}")
-                    time.sleep(0.5)
+                    print(f"♻️ Cached: {url}" if resp.from_cache else f"✅ Fetched: {url}")
+                    if resp.fetched:
+                        # Politeness delay whenever we hit the site (304 revalidations included)
+                        time.sleep(0.5)
+                except PageRejected as e:
+                    rejected.append({"source_url": url, "reason": e.reason})
+                    print(f"🚫 Skipped ({e.reason}): {url}")
+                    if e.fetched:
+                        # Rejected after a request went out, so still be polite
+                        time.sleep(0.5)
                 except Exception as e:
                     print(f"⚠️ Error fetching {url}: {e}")
 
@@ -72,10 +112,19 @@ def crawl(query, start_date=None, end_date=None, n=40):
         print(f"❌ DuckDuckGo search failed: {e}")
 
     # 📁 Save results
+    file_name = f"{query.replace(' ', '_').lower()}_{start_date.date()}_{end_date.date()}.jsonl"
+    if rejected:
+        # Kept outside data/raw so process.find_latest_raw never picks it up
+        os.makedirs("data/rejected", exist_ok=True)
+        with open(f"data/rejected/{file_name}", "w", encoding="utf-8") as f:
+            for r in rejected:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        print(f"🚫 Rejected {len(rejected)} pages before parsing (see data/rejected/{file_name})")
+
     if not out:
         print("⚠️ No articles found for this query.")
     else:
-        out_path = f"data/raw/{query.replace(' ', '_').lower()}_{start_date.date()}_{end_date.date()}.jsonl"
+        out_path = f"data/raw/{file_name}"
         with open(out_path, "w", encoding="utf-8") as f:
             for o in out:
                 f.write(json.dumps(o, ensure_ascii=False) + "\n")
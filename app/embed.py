@@ -1,4 +1,7 @@
 from sentence_transformers import SentenceTransformer
-_model = SentenceTransformer("all-MiniLM-L6-v2")
+_model = None  # loaded on first use so importing the pipeline doesn't pull the model
 def embed(sentences):
+    global _model
+    if _model is None:
+        _model = SentenceTransformer("all-MiniLM-L6-v2")
     return _model.encode(sentences, normalize_embeddings=True)
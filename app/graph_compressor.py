@@ -6,6 +6,7 @@ import os
 # Use existing embedding and clustering functions
 from app.embed import embed 
 from app.cluster import build_index 
+from app.causal_index import save_graph
 
 # 1. Define Causal Link Weights (for structural analysis)
 CAUSAL_WEIGHTS = {
@@ -14,8 +15,11 @@ CAUSAL_WEIGHTS = {
     'TEMPORAL_SEQUENCE': 0.5,
 }
 
-def build_causal_graph(causal_events: list):
-    """Builds a directed, weighted graph where nodes are events and edges are causal/semantic links."""
+def build_causal_graph(causal_events: list, embs=None):
+    """
+    Builds a directed, weighted graph where nodes are events and edges are causal/semantic links.
+    `embs` (one row per event, e.g. from dedup) skips re-embedding the summaries.
+    """
     G = nx.DiGraph() 
     
     for i, event in enumerate(causal_events):
@@ -28,7 +32,7 @@ def build_causal_graph(causal_events: list):
 
     if not valid_summaries: return G
 
-    embs = embed(valid_summaries)
+    embs = embed(valid_summaries) if embs is None else np.asarray(embs)[valid_summaries_indices]
     index = build_index(embs) 
     
     # 2. Add Edges based on LLM's explicit Causal Link
@@ -83,13 +87,16 @@ def compress_timeline(G: nx.DiGraph, top_k_events: int = 10):
             break
         
         event_data = G.nodes[rank_idx]['data']
-        final_timeline_events.append(event_data)
+        # Keep the node id so the timeline can link into the causal query API
+        final_timeline_events.append({**event_data, 'event_id': rank_idx})
         
     # Final sort by date
     return sorted(final_timeline_events, key=lambda x: x.get('event_date') or "9999-99-99", reverse=True)
 
 
-def generate_causal_timeline(causal_events: list, top_k: int = 10):
-    """Orchestrates graph building and compression."""
-    G = build_causal_graph(causal_events)
+def generate_causal_timeline(causal_events: list, top_k: int = 10, graph_path: str = None, embs=None):
+    """Orchestrates graph building and compression; persists the graph if `graph_path` is given."""
+    G = build_causal_graph(causal_events, embs)
+    if graph_path:
+        save_graph(G, graph_path)
     return compress_timeline(G, top_k)
\ No newline at end of file
@@ -0,0 +1,149 @@
+# app/http_cache.py
+import os, json, time, hashlib
+import requests
+
+try:
+    from app.prefilter import PageRejected, check_url, check_headers, check_body, MAX_BYTES
+    from app.storage import write_json
+except ImportError:
+    from prefilter import PageRejected, check_url, check_headers, check_body, MAX_BYTES
+    from storage import write_json
+
+# 📦 On-disk cache for crawler traffic (article pages + DDGS search results)
+CACHE_DIR = os.getenv("CRAWL_CACHE_DIR", "data/cache")
+SEARCH_TTL = int(os.getenv("CRAWL_SEARCH_TTL", "900"))  # seconds
+# Offline replay: serve only from cache, never touch the network
+OFFLINE = os.getenv("CRAWL_OFFLINE", "0").lower() in ("1", "true", "yes")
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response built from a cache entry."""
+
+    def __init__(self, url, status_code, headers, text, from_cache=False, fetched=True):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+        self.from_cache = from_cache
+        self.fetched = fetched  # False only when no network request was made
+
+
+def _key(*parts):
+    return hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+def _path(kind, key):
+    d = os.path.join(CACHE_DIR, kind)
+    os.makedirs(d, exist_ok=True)
+    return os.path.join(d, f"{key}.json")
+
+
+def _read(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _read_capped(r, max_bytes):
+    """Stream the body, giving up as soon as it exceeds `max_bytes`."""
+    chunks, size = [], 0
+    for chunk in r.iter_content(chunk_size=64 * 1024):
+        size += len(chunk)
+        if size > max_bytes:
+            raise PageRejected(f"too_large:>{max_bytes}")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def cached_get(url, headers=None, timeout=10, offline=None, max_bytes=MAX_BYTES):
+    """
+    GET `url` through the page cache.
+    Cached pages are revalidated with If-None-Match / If-Modified-Since;
+    a 304 reuses the stored body. In offline mode a cache miss returns None.
+    Fresh downloads go through app/prefilter (URL, headers, capped streamed
+    body) and raise PageRejected before anything is parsed or cached.
+    """
+    offline = OFFLINE if offline is None else offline
+    path = _path("pages", _key(url))
+    entry = _read(path)
+
+    if offline:
+        if not entry:
+            return None
+        return CachedResponse(url, entry["status_code"], entry["headers"], entry["text"], from_cache=True, fetched=False)
+
+    reason = check_url(url)
+    if reason:
+        raise PageRejected(reason, fetched=False)
+
+    req_headers = dict(headers or {})
+    if entry:
+        if entry["headers"].get("ETag"):
+            req_headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            req_headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+    with requests.get(url, headers=req_headers, timeout=timeout, stream=True) as r:
+        if r.status_code == 304 and entry:
+            entry["fetched_at"] = time.time()
+            write_json(path, entry)
+            return CachedResponse(url, entry["status_code"], entry["headers"], entry["text"], from_cache=True)
+
+        if r.status_code != 200:
+            raise PageRejected(f"http_status:{r.status_code}")
+        reason = check_headers(r.headers, max_bytes)
+        if reason:
+            raise PageRejected(reason)
+
+        body = _read_capped(r, max_bytes)
+        reason = check_body(body)
+        if reason:
+            raise PageRejected(reason)
+
+        text = body.decode(r.encoding or "utf-8", errors="replace")
+        kept = {h: r.headers[h] for h in ("ETag", "Last-Modified", "Content-Type") if h in r.headers}
+
+    write_json(path, {
+        "url": url,
+        "status_code": 200,
+        "headers": kept,
+        "text": text,
+        "fetched_at": time.time(),
+    })
+    return CachedResponse(url, 200, kept, text)
+
+
+def cached_search(kind, fn, query, region, window, ttl=None, offline=None):
+    """
+    Return DDGS `kind` ("news"/"text") results for (query, region, window), calling `fn()` only when
+    the cached copy is older than `ttl` seconds. Offline mode ignores the TTL and, if this exact
+    window was never cached, falls back to the newest search for (kind, query, region).
+    """
+    ttl = SEARCH_TTL if ttl is None else ttl
+    offline = OFFLINE if offline is None else offline
+    path = _path("search", _key(kind, query, region, *window))
+    entry = _read(path)
+
+    if entry and (offline or time.time() - entry["fetched_at"] < ttl):
+        return entry["results"]
+    if offline:
+        latest = _read(_path("search", _key(kind, query, region, "latest")))
+        return latest["results"] if latest else []
+
+    results = list(fn())
+    entry = {"query": query, "region": region, "window": [str(w) for w in window],
+             "results": results, "fetched_at": time.time()}
+    write_json(path, entry)
+    write_json(_path("search", _key(kind, query, region, "latest")), entry)
+    return results
+
+
+def replay_window(query, region):
+    """Window (start, end) ISO dates of the newest cached search for `query`, or None."""
+    entries = [_read(_path("search", _key(kind, query, region, "latest"))) for kind in ("news", "text")]
+    entries = [e for e in entries if e]
+    if not entries:
+        return None
+    return max(entries, key=lambda e: e["fetched_at"])["window"]
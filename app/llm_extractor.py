@@ -0,0 +1,256 @@
+# app/llm_extractor.py
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import hashlib
+
+# ⚡ Pluggable extraction backends for process.py.
+# Every backend exposes `await extractor.extract_all([(text, topic), ...])` and
+# returns one dict per input in the shape produced by extract_causal_event
+# (None where extraction failed). Pick one with EXTRACTOR_BACKEND=rules|stub|http.
+
+try:
+    from app.event_extractor import extract_causal_event
+    from app.storage import write_json
+except ImportError:
+    from event_extractor import extract_causal_event
+    from storage import write_json
+
+EXTRACTOR_BACKEND = os.getenv("EXTRACTOR_BACKEND", "rules")
+LLM_ENDPOINT = os.getenv("LLM_ENDPOINT", "http://127.0.0.1:8001/extract")
+LLM_MODEL = os.getenv("LLM_MODEL")              # required for the http backend
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "8"))
+LLM_RATE = float(os.getenv("LLM_RATE", "5"))        # requests per second
+LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", "3"))
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "data/cache/llm")
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens/second, at most `capacity` banked."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RuleBasedExtractor:
+    """The current synchronous path, wrapped in the common interface."""
+
+    async def extract_all(self, items):
+        # One bad document yields None instead of aborting the whole run
+        results = []
+        for text, topic in items:
+            try:
+                results.append(extract_causal_event(text, topic))
+            except Exception as e:
+                print(f"⚠️ Rule-based extraction failed: {e}")
+                results.append(None)
+        return results
+
+
+class StubLLMClient:
+    """
+    Local stand-in for a model server: sleeps for a configurable latency,
+    optionally fails, and answers with the rule-based extraction.
+    """
+
+    cache_namespace = "stub"
+
+    def __init__(self, latency=0.8, jitter=0.4, per_doc=0.05, failure_rate=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.per_doc = per_doc
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+
+    async def complete(self, batch):
+        await asyncio.sleep(self.latency + self._rng.uniform(0, self.jitter) + self.per_doc * len(batch))
+        if self._rng.random() < self.failure_rate:
+            raise RuntimeError("stub model: simulated failure")
+        return [extract_causal_event(text, topic) for text, topic in batch]
+
+
+class HTTPLLMClient:
+    """
+    POSTs {"model", "documents": [{"text", "topic"}]} to LLM_ENDPOINT and expects
+    {"events": [...]} back, one event per document.
+    """
+
+    def __init__(self, model, endpoint=LLM_ENDPOINT, timeout=60):
+        if not model:
+            raise ValueError("HTTPLLMClient needs a model name (set LLM_MODEL)")
+        self.endpoint = endpoint
+        self.model = model
+        self.timeout = timeout
+        self.cache_namespace = f"http:{endpoint}:{model}"
+
+    def _post(self, batch):
+        import requests
+        payload = {"model": self.model, "documents": [{"text": t, "topic": q} for t, q in batch]}
+        r = requests.post(self.endpoint, json=payload, timeout=self.timeout)
+        r.raise_for_status()
+        return r.json()["events"]
+
+    async def complete(self, batch):
+        # requests is blocking; keep it off the event loop
+        return await asyncio.to_thread(self._post, batch)
+
+
+class AsyncLLMExtractor:
+    """
+    Batched async extraction over any client with `await client.complete(batch)`.
+    Bounded concurrency, token-bucket rate limiting, retries with exponential
+    backoff and an on-disk response cache keyed by a hash of (backend, topic, text),
+    where the backend is the client's `cache_namespace` (stub vs. endpoint + model),
+    so different backends never share entries.
+    """
+
+    def __init__(self, client, batch_size=LLM_BATCH_SIZE, concurrency=LLM_CONCURRENCY,
+                 rate=LLM_RATE, burst=LLM_BURST, retries=LLM_RETRIES, backoff=0.5, cache_dir=LLM_CACHE_DIR):
+        self.client = client
+        self.cache_namespace = getattr(client, "cache_namespace", type(client).__name__)
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.bucket_args = (rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.cache_dir = cache_dir
+        # Benchmark counters: per-document latency of the model call that produced it
+        # (semaphore entry -> response, rate-limit waits and retries included), cache
+        # hits kept apart so they don't skew the percentiles, and wall time per run
+        self.latencies = []
+        self.cache_hits = 0
+        self.run_seconds = []
+
+    def _cache_path(self, text, topic):
+        key = hashlib.sha256(f"{self.cache_namespace}\x1f{topic}\x1f{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json") if self.cache_dir else None
+
+    def _cache_get(self, path):
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _cache_put(self, path, event):
+        if not path or not event:
+            return
+        write_json(path, event)
+
+    async def _call(self, batch, sem, bucket):
+        async with sem:
+            started = time.perf_counter()
+            for attempt in range(self.retries + 1):
+                await bucket.acquire()
+                try:
+                    events = await self.client.complete(batch)
+                    if len(events) != len(batch):
+                        raise ValueError(f"expected {len(batch)} events, got {len(events)}")
+                    break
+                except Exception as e:
+                    if attempt == self.retries:
+                        print(f"⚠️ Extraction batch failed after {attempt + 1} attempts: {e}")
+                        events = [None] * len(batch)
+                        break
+                    await asyncio.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+            self.latencies.extend([time.perf_counter() - started] * len(batch))
+            return events
+
+    async def extract_all(self, items):
+        start = time.perf_counter()
+        results = [None] * len(items)
+        paths = [self._cache_path(text, topic) for text, topic in items]
+
+        pending = []
+        for i, p in enumerate(paths):
+            cached = self._cache_get(p)
+            if cached is not None:
+                results[i] = cached
+                self.cache_hits += 1
+            else:
+                pending.append(i)
+
+        # Semaphore/bucket are created here so they bind to the running loop
+        sem = asyncio.Semaphore(self.concurrency)
+        bucket = TokenBucket(*self.bucket_args)
+
+        async def run(idx):
+            events = await self._call([items[i] for i in idx], sem, bucket)
+            for i, event in zip(idx, events):
+                results[i] = event
+                self._cache_put(paths[i], event)
+
+        chunks = [pending[k:k + self.batch_size] for k in range(0, len(pending), self.batch_size)]
+        await asyncio.gather(*(run(c) for c in chunks))
+        self.run_seconds.append(time.perf_counter() - start)
+        return results
+
+
+def get_extractor(backend=EXTRACTOR_BACKEND):
+    if backend == "rules":
+        return RuleBasedExtractor()
+    if backend == "stub":
+        return AsyncLLMExtractor(StubLLMClient())
+    if backend == "http":
+        return AsyncLLMExtractor(HTTPLLMClient(LLM_MODEL))
+    raise ValueError(f"Unknown EXTRACTOR_BACKEND '{backend}' (expected rules, stub or http)")
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+if __name__ == "__main__":
+    # Offline benchmark: python -m app.llm_extractor [n_docs] [stub_latency_s]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.8
+    items = [(f"Document {i}. Markets moved after the policy change due to rising costs. " * 20, "benchmark")
+             for i in range(n)]
+
+    t0 = time.perf_counter()
+    for text, topic in items:
+        extract_causal_event(text, topic)
+    t_rules = time.perf_counter() - t0
+    print(f"rules   : {n} docs in {t_rules:.3f}s ({n / max(t_rules, 1e-9):.0f} docs/s)")
+
+    # One blocking model call per document, as process.py would do naively
+    stub = StubLLMClient(latency=latency, jitter=latency / 2)
+    seq_n = min(n, 10)
+    t0 = time.perf_counter()
+    for item in items[:seq_n]:
+        asyncio.run(stub.complete([item]))
+    t_seq = (time.perf_counter() - t0) / seq_n
+    print(f"stub seq: ~{t_seq:.2f}s/doc -> est. {t_seq * n:.1f}s for {n} docs")
+
+    ex = AsyncLLMExtractor(StubLLMClient(latency=latency, jitter=latency / 2), cache_dir=None)
+    asyncio.run(ex.extract_all(items))
+    t_async = ex.run_seconds[-1]
+    print(f"stub async (batch={ex.batch_size}, conc={ex.concurrency}, rate={ex.bucket_args[0]}/s):")
+    print(f"  throughput: {n} docs in {t_async:.2f}s ({n / t_async:.1f} docs/s)")
+    # Per-call latency (semaphore entry -> response), cache hits excluded
+    print(f"  per-doc call latency: p50 {_percentile(ex.latencies, 0.5):.2f}s  "
+          f"p95 {_percentile(ex.latencies, 0.95):.2f}s  p99 {_percentile(ex.latencies, 0.99):.2f}s  "
+          f"(cache hits: {ex.cache_hits})")
@@ -0,0 +1,75 @@
+# app/prefilter.py
+import os, re
+from urllib.parse import urlparse
+
+# 🚦 Cheap checks run before the full download + BeautifulSoup parse.
+# Each check returns a rejection reason (str) or None if the page may continue.
+
+MAX_BYTES = int(os.getenv("CRAWL_MAX_BYTES", str(2 * 1024 * 1024)))
+MIN_TEXT_CHARS = 400  # same threshold the crawler applies after parsing
+
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+SKIP_EXTENSIONS = (".pdf", ".mp4", ".mp3", ".m3u8", ".jpg", ".jpeg", ".png", ".gif", ".zip")
+VIDEO_HOSTS = ("youtube.com", "youtu.be", "vimeo.com", "dailymotion.com")
+VIDEO_PATH = re.compile(r"/(videos?|watch|live-tv)/", re.I)
+
+PAYWALL_MARKERS = [
+    re.compile(rb'"isAccessibleForFree"\s*:\s*"?false"?', re.I),
+    # whole class tokens only, so "no-paywall" / "paywall-free" don't count
+    re.compile(rb'class="[^"]*(?<![\w-])paywall(?:-container|-wrapper)?(?![\w-])', re.I),
+    re.compile(rb"subscribe to (continue|read) (reading|this)", re.I),
+]
+
+_DROP_BLOCKS = re.compile(rb"<(script|style|noscript|svg|iframe)\b.*?</\1\s*>", re.I | re.S)
+_TAGS = re.compile(rb"<[^>]*>")
+_ENTITIES = re.compile(rb"&#?\w+;")
+_SPACES = re.compile(rb"\s+")
+
+
+class PageRejected(Exception):
+    """
+    Raised when a page is dropped by the pre-filter; `reason` says why and
+    `fetched` whether the site was contacted before the page was dropped.
+    """
+
+    def __init__(self, reason, fetched=True):
+        super().__init__(reason)
+        self.reason = reason
+        self.fetched = fetched
+
+
+def check_url(url):
+    parsed = urlparse(url)
+    path = parsed.path.lower()
+    if path.endswith(SKIP_EXTENSIONS):
+        return f"non_html_extension:{os.path.splitext(path)[1]}"
+    host = parsed.netloc.lower()
+    if any(host == h or host.endswith("." + h) for h in VIDEO_HOSTS) or VIDEO_PATH.search(path):
+        return "video_page"
+    return None
+
+
+def check_headers(headers, max_bytes=MAX_BYTES):
+    ctype = (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+    if ctype and ctype not in HTML_TYPES:
+        return f"content_type:{ctype}"
+    length = headers.get("Content-Length")
+    if length and length.isdigit() and int(length) > max_bytes:
+        return f"too_large:{length}"
+    return None
+
+
+def estimate_text_chars(body: bytes) -> int:
+    """Rough visible-text length: drop script/style blocks and tags, collapse whitespace."""
+    body = _DROP_BLOCKS.sub(b" ", body)
+    body = _TAGS.sub(b" ", body)
+    body = _ENTITIES.sub(b" ", body)
+    return len(_SPACES.sub(b" ", body).strip())
+
+
+def check_body(body: bytes, min_chars=MIN_TEXT_CHARS):
+    if any(p.search(body) for p in PAYWALL_MARKERS):
+        return "paywall"
+    if estimate_text_chars(body) < min_chars:
+        return "low_text_density"
+    return None
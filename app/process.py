@@ -1,11 +1,12 @@
 import os
 import json
-from datetime import datetime
+import asyncio
+from datetime import datetime, date
 from bs4 import BeautifulSoup
 import re
 
 # Import the new structural analysis tool using relative path
-from .event_extractor import extract_causal_event 
+from .llm_extractor import get_extractor
 # Note: extract_text_from_html is now defined within this file, 
 # or should be fully imported from .clean. We will define it here 
 # for simplicity, as we can assume the clean logic is self-contained.
@@ -112,7 +113,9 @@ def process_raw_to_processed(input_path):
         f"causal_events_{os.path.basename(input_path)}"
     )
 
-    processed_events = []
+    # 1. Clean Text & Get Date for every document first, so the extractor
+    #    backend (rules / async LLM) can batch them
+    docs = []
     with open(input_path, encoding="utf-8") as f:
         for line in f:
             try:
@@ -121,7 +124,6 @@ def process_raw_to_processed(input_path):
                 if not html.strip():
                     continue
                 
-                # 1. Clean Text & Get Date
                 # We assume extract_text_from_html is correctly defined in app/clean.py
                 text = extract_text_from_html(html)
                 doc_date = obj.get("date") # Date retrieved by the crawler (e.g., "2025-11-15")
@@ -130,31 +132,35 @@ def process_raw_to_processed(input_path):
                 if not doc_date:
                     doc_date = date.today().isoformat()
 
-                # 2. 🔑 Core Novelty Step: Extract Structured Causal Event
-                causal_data = extract_causal_event(text, query_topic)
-
-                if causal_data and causal_data.get('milestone_summary'):
-                    
-                    # 🚨 DATE FIX 2: Correct the LLM's event_date if it's using the mock placeholder.
-                    llm_extracted_date = causal_data.get('event_date')
-                    
-                    # If the LLM's mock date is static, use the crawler's date (doc_date)
-                    # We check against the literal placeholder date that was used.
-                    if llm_extracted_date in ["2025-01-01", "YYYY-MM-DD", None] or llm_extracted_date == date.today().isoformat():
-                        causal_data['event_date'] = doc_date 
-                    
-                    # Store the original publication date from the document
-                    causal_data['doc_date'] = doc_date 
-
-                    # Merge structured data with source info
-                    processed_events.append({
-                        "source_url": obj.get("source_url"),
-                        **causal_data # Add the structured event and causal links
-                    })
-
+                docs.append((obj.get("source_url"), text, doc_date))
             except Exception as e:
                 # In a robust system, we would log this error.
                 continue
+
+    # 2. 🔑 Core Novelty Step: Extract Structured Causal Events (EXTRACTOR_BACKEND)
+    extractor = get_extractor()
+    extracted = asyncio.run(extractor.extract_all([(text, query_topic) for _, text, _ in docs]))
+
+    processed_events = []
+    for (source_url, _, doc_date), causal_data in zip(docs, extracted):
+        if causal_data and causal_data.get('milestone_summary'):
+            
+            # 🚨 DATE FIX 2: Correct the LLM's event_date if it's using the mock placeholder.
+            llm_extracted_date = causal_data.get('event_date')
+            
+            # If the LLM's mock date is static, use the crawler's date (doc_date)
+            # We check against the literal placeholder date that was used.
+            if llm_extracted_date in ["2025-01-01", "YYYY-MM-DD", None] or llm_extracted_date == date.today().isoformat():
+                causal_data['event_date'] = doc_date 
+            
+            # Store the original publication date from the document
+            causal_data['doc_date'] = doc_date 
+
+            # Merge structured data with source info
+            processed_events.append({
+                "source_url": source_url,
+                **causal_data # Add the structured event and causal links
+            })
                 
     with open(output_path, "w", encoding="utf-8") as out:
         for p in processed_events:
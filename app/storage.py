@@ -0,0 +1,11 @@
+# app/storage.py
+import os, json
+
+
+def write_json(path, obj):
+    """Write `obj` as JSON via a temp file + os.replace, so readers never see a half-written file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp, path)
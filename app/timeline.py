@@ -9,11 +9,13 @@ from typing import List
 try:
     from app.embed import embed 
     from app.graph_compressor import generate_causal_timeline 
+    from app.dedup import dedup_events
 except ImportError:
     # Fallback for direct execution (e.g., python app/timeline.py)
     # Assumes local imports are available
     from embed import embed
     from graph_compressor import generate_causal_timeline
+    from dedup import dedup_events
 
 
 def choose_processed_path():
@@ -58,29 +60,37 @@ def load_causal_events(processed_path: str):
     return causal_events
 
 
-def to_timeline(causal_events: List[dict]):
+def to_timeline(causal_events: List[dict], graph_path: str = None):
     """
     Runs Causal Graph Modeling and Compression to select salient events.
     This replaces the simple semantic clustering.
+    If `graph_path` is given, the causal graph is saved there for the /events queries.
     """
     if not causal_events:
         return []
 
+    # 🧹 Collapse syndicated near-duplicates so they don't become separate nodes
+    # (its embeddings are reused by the graph builder instead of re-embedding)
+    causal_events, embs = dedup_events(causal_events, return_embeddings=True)
+
     print(f"🧠 Running Causal Graph Analysis on {len(causal_events)} extracted events...")
     
     # 🔑 CORE NOVELTY: Call the Graph Compressor
     # top_k=10 is the max events to display
-    compressed_timeline = generate_causal_timeline(causal_events, top_k=10) 
+    compressed_timeline = generate_causal_timeline(causal_events, top_k=10, graph_path=graph_path, embs=embs)
 
     final_output = []
     for event in compressed_timeline:
         # Use the structured data fields for clean output
         final_output.append({
+            "event_id": event.get("event_id"),
             # Prioritize the LLM-extracted event_date, fallback to doc_date
             "date": event.get("event_date", event.get("doc_date")), 
             "summary": event.get("milestone_summary", "Summary not available."),
             "url": event.get("source_url"),
-            "causal_agent": event.get("causal_agent") 
+            "causal_agent": event.get("causal_agent"),
+            "source_count": event.get("source_count", 1),
+            "source_urls": event.get("source_urls", [event.get("source_url")])
         })
         
     print(f"✅ Final Causal Timeline generated with {len(final_output)} milestone events.")
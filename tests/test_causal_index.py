@@ -0,0 +1,59 @@
+import networkx as nx
+import pytest
+
+from app import causal_index
+from app.causal_index import CausalIndex, build_reachability, graph_path_by_id, load_index, save_graph
+
+
+def make_graph():
+    # 0 -> 1 -> 2 -> 3 is strong; the direct 0 -> 2 edge is weak
+    G = nx.DiGraph()
+    for i in range(5):
+        G.add_node(i, data={"milestone_summary": f"event {i}", "event_date": f"2025-01-0{i + 1}"})
+    G.add_edge(0, 1, weight=1.0)
+    G.add_edge(1, 2, weight=0.5)
+    G.add_edge(0, 2, weight=0.4)
+    G.add_edge(2, 3, weight=0.8)
+    return G
+
+
+def test_build_reachability_does_not_mutate_graph():
+    G = make_graph()
+    build_reachability(G)
+    assert all(set(d) == {"weight"} for _, _, d in G.edges(data=True))
+
+
+def test_hops_are_bfs_distance_and_strength_is_strongest_path():
+    idx = CausalIndex(build_reachability(make_graph()))
+    effects = {e["event_id"]: e for e in idx.effects(0)}
+    assert effects[1]["hops"] == 1 and effects[1]["strength"] == 1.0
+    # 0 -> 2 is a direct edge, but the strongest path is 0 -> 1 -> 2 (0.5 vs 0.4)
+    assert effects[2]["hops"] == 1
+    assert effects[2]["strength"] == 0.5 and effects[2]["path_hops"] == 2
+    assert effects[3]["hops"] == 2 and effects[3]["path_hops"] == 3
+    # Direct effects stay in hop-bounded queries even when a longer path is stronger
+    assert [e["event_id"] for e in idx.effects(0, max_hops=1)] == [1, 2]
+    assert {e["event_id"] for e in idx.causes(2, max_hops=1)} == {0, 1}
+
+
+def test_causes_chain_and_unknown_ids():
+    idx = CausalIndex(build_reachability(make_graph()))
+    causes = idx.causes(3)
+    assert causes[0]["event_id"] == 2  # the only direct cause comes first
+    assert {e["event_id"] for e in causes} == {0, 1, 2}
+    chain = idx.chain(0, 3)
+    assert chain["strength"] == 0.4
+    assert [e["event_id"] for e in chain["events"]] == [0, 1, 2, 3]
+    assert idx.chain(3, 0) is None
+    assert idx.causes(4) == []
+    assert idx.causes(99) is None
+
+
+def test_save_and_load_by_graph_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(causal_index, "GRAPH_DIR", str(tmp_path))
+    save_graph(make_graph(), graph_path_by_id("causal_events_topic"))
+    idx = load_index(graph_path_by_id("causal_events_topic"))
+    assert idx.chain(0, 1)["strength"] == 1.0
+    for bad in ("", "..", "../x", "a/b"):
+        with pytest.raises(ValueError):
+            graph_path_by_id(bad)
@@ -0,0 +1,60 @@
+import numpy as np
+
+from app.dedup import dedup_events, lsh_pairs, merge_group, minhash, shingles
+
+CEASEFIRE = "India and Pakistan agree to a ceasefire along the border after talks on Saturday"
+
+
+def event(summary, url, date="2025-05-10", link="TEMPORAL_SEQUENCE"):
+    return {"milestone_summary": summary, "source_url": url, "event_date": date, "causal_link_strength": link}
+
+
+def orthogonal(n):
+    # Unrelated embeddings, so only MinHash can group events
+    return np.eye(n, dtype="float32")
+
+
+def test_minhash_candidates_for_syndicated_copy():
+    sigs = [minhash(shingles(s)) for s in (
+        CEASEFIRE,
+        CEASEFIRE + " evening",
+        "Stock markets rally as inflation cools in the United States",
+    )]
+    assert lsh_pairs(sigs) == {(0, 1)}
+
+
+def test_merge_group_keeps_earliest_event_and_all_sources():
+    merged = merge_group([
+        event("Short copy", "https://b.example", date="2025-05-11", link="DIRECT_CAUSE"),
+        event("Original longer report", "https://a.example", date="2025-05-10"),
+        event("Original report", "https://a.example", date="2025-05-10"),
+    ])
+    assert merged["milestone_summary"] == "Original longer report"
+    assert merged["causal_link_strength"] == "DIRECT_CAUSE"
+    assert merged["source_count"] == 3
+    assert merged["source_urls"] == ["https://b.example", "https://a.example"]
+
+
+def test_dedup_groups_by_minhash():
+    events = [
+        event(CEASEFIRE, "https://a.example"),
+        event("Stock markets rally as inflation cools in the United States", "https://c.example"),
+        event(CEASEFIRE + " evening", "https://b.example"),
+    ]
+    merged, embs = dedup_events(events, embs=orthogonal(3), return_embeddings=True)
+    assert [e["source_count"] for e in merged] == [2, 1]
+    assert merged[0]["source_urls"] == ["https://a.example", "https://b.example"]
+    # Same date, so the longer copy is canonical and its embedding row is kept
+    assert merged[0]["milestone_summary"] == CEASEFIRE + " evening"
+    assert np.array_equal(embs, orthogonal(3)[[2, 1]])
+
+
+def test_dedup_groups_by_embedding_similarity():
+    events = [
+        event("Government announces new fuel subsidy", "https://a.example"),
+        event("Fuel subsidy unveiled by the centre", "https://b.example"),
+        event("Monsoon arrives early in Kerala", "https://c.example"),
+    ]
+    embs = np.array([[1, 0], [1, 0], [0, 1]], dtype="float32")
+    merged = dedup_events(events, embs=embs)
+    assert [e["source_count"] for e in merged] == [2, 1]
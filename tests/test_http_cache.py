@@ -0,0 +1,118 @@
+import time
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+from app import http_cache
+from app.http_cache import cached_get, cached_search, replay_window
+from app.prefilter import PageRejected
+
+URL = "https://news.example/world/story"
+PAGE = b"<html><body><p>" + b"word " * 200 + b"</p></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.encoding = "utf-8"
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeServer:
+    """Serves PAGE with validators and answers 304 when they match."""
+
+    def __init__(self, body=PAGE, content_type="text/html; charset=utf-8"):
+        self.body = body
+        self.content_type = content_type
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        headers = headers or {}
+        self.requests.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, self.body, {
+            "Content-Type": self.content_type,
+            "ETag": '"v1"',
+            "Last-Modified": "Mon, 01 Sep 2025 00:00:00 GMT",
+        })
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "CACHE_DIR", str(tmp_path))
+    fake = FakeServer()
+    monkeypatch.setattr(http_cache.requests, "get", fake.get)
+    return fake
+
+
+def test_conditional_get_reuses_body_on_304(server):
+    first = cached_get(URL, offline=False)
+    assert first.status_code == 200 and not first.from_cache and first.fetched
+
+    second = cached_get(URL, offline=False)
+    assert server.requests[1]["If-None-Match"] == '"v1"'
+    assert server.requests[1]["If-Modified-Since"] == "Mon, 01 Sep 2025 00:00:00 GMT"
+    assert second.from_cache and second.fetched
+    assert second.text == first.text
+
+
+def test_offline_serves_cache_and_misses_return_none(server):
+    cached_get(URL, offline=False)
+    replay = cached_get(URL, offline=True)
+    assert replay.from_cache and not replay.fetched
+    assert cached_get("https://news.example/other", offline=True) is None
+    assert len(server.requests) == 1
+
+
+def test_rejections_are_not_cached(server):
+    server.content_type = "application/pdf"
+    with pytest.raises(PageRejected) as e:
+        cached_get(URL, offline=False)
+    assert e.value.reason == "content_type:application/pdf" and e.value.fetched
+    assert cached_get(URL, offline=True) is None
+
+    with pytest.raises(PageRejected) as e:
+        cached_get("https://news.example/report.pdf", offline=False)
+    assert not e.value.fetched
+
+
+def test_search_ttl(server, monkeypatch):
+    calls = []
+
+    def search():
+        calls.append(1)
+        return [{"url": URL}]
+
+    window = ("2025-09-01", "2025-09-30")
+    assert cached_search("news", search, "q", "in-en", window, ttl=60, offline=False) == [{"url": URL}]
+    cached_search("news", search, "q", "in-en", window, ttl=60, offline=False)
+    assert len(calls) == 1
+
+    later = time.time() + 120
+    monkeypatch.setattr(http_cache.time, "time", lambda: later)
+    cached_search("news", search, "q", "in-en", window, ttl=60, offline=False)
+    assert len(calls) == 2
+
+
+def test_offline_search_falls_back_to_latest_window(server):
+    cached_search("news", lambda: [{"url": URL}], "q", "in-en", ("2025-09-01", "2025-09-30"), offline=False)
+
+    def network():
+        raise AssertionError("offline replay must not search")
+
+    assert cached_search("news", network, "q", "in-en", ("2025-10-01", "2025-10-31"), offline=True) == [{"url": URL}]
+    assert cached_search("news", network, "other", "in-en", ("2025-10-01", "2025-10-31"), offline=True) == []
+    assert replay_window("q", "in-en") == ["2025-09-01", "2025-09-30"]
+    assert replay_window("other", "in-en") is None
@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+
+from app import llm_extractor
+from app.llm_extractor import AsyncLLMExtractor, HTTPLLMClient, RuleBasedExtractor, StubLLMClient, TokenBucket
+
+ITEMS = [(f"Doc {i}. Prices rose due to the new tax.", "topic") for i in range(5)]
+
+
+class FlakyClient:
+    """Fails the first `failures` calls, then answers like the stub."""
+
+    cache_namespace = "flaky"
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    async def complete(self, batch):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("boom")
+        return [{"milestone_summary": text} for text, _ in batch]
+
+
+def extractor(client, **kwargs):
+    kwargs.setdefault("rate", 1000)
+    kwargs.setdefault("burst", 1000)
+    kwargs.setdefault("backoff", 0)
+    return AsyncLLMExtractor(client, **kwargs)
+
+
+def test_retries_then_succeeds():
+    client = FlakyClient(failures=2)
+    results = asyncio.run(extractor(client, batch_size=5, retries=3, cache_dir=None).extract_all(ITEMS))
+    assert client.calls == 3
+    assert [r["milestone_summary"] for r in results] == [t for t, _ in ITEMS]
+
+
+def test_exhausted_retries_degrade_to_none():
+    client = FlakyClient(failures=10)
+    results = asyncio.run(extractor(client, batch_size=5, retries=1, cache_dir=None).extract_all(ITEMS))
+    assert client.calls == 2
+    assert results == [None] * len(ITEMS)
+
+
+def test_cache_hits_skip_the_client(tmp_path):
+    asyncio.run(extractor(FlakyClient(0), cache_dir=str(tmp_path)).extract_all(ITEMS))
+    client = FlakyClient(0)
+    results = asyncio.run(extractor(client, cache_dir=str(tmp_path)).extract_all(ITEMS))
+    assert client.calls == 0
+    assert all(r["milestone_summary"] for r in results)
+
+
+def test_backends_never_share_cache_entries(tmp_path):
+    stub = extractor(StubLLMClient(latency=0, jitter=0, per_doc=0), cache_dir=str(tmp_path))
+    http = extractor(HTTPLLMClient("some-model"), cache_dir=str(tmp_path))
+    other = extractor(HTTPLLMClient("other-model"), cache_dir=str(tmp_path))
+    text, topic = ITEMS[0]
+    assert len({e._cache_path(text, topic) for e in (stub, http, other)}) == 3
+
+
+def test_http_backend_requires_a_model(monkeypatch):
+    monkeypatch.setattr(llm_extractor, "LLM_MODEL", None)
+    with pytest.raises(ValueError):
+        llm_extractor.get_extractor("http")
+
+
+def test_rule_based_isolates_failures(monkeypatch):
+    def extract(text, topic):
+        if "bad" in text:
+            raise ValueError("bad document")
+        return {"milestone_summary": text}
+
+    monkeypatch.setattr(llm_extractor, "extract_causal_event", extract)
+    results = asyncio.run(RuleBasedExtractor().extract_all([("ok", "t"), ("bad", "t"), ("fine", "t")]))
+    assert results == [{"milestone_summary": "ok"}, None, {"milestone_summary": "fine"}]
+
+
+def test_token_bucket_limits_rate():
+    async def take(n):
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # 1 banked token + 5 more at 50/s -> at least ~0.1s
+    assert asyncio.run(take(6)) >= 0.09
+
+
+def test_latencies_are_per_call_and_exclude_cache_hits(tmp_path):
+    # Two batches of 2 docs; concurrency 1 makes the second batch queue behind the first
+    stub = StubLLMClient(latency=0.05, jitter=0, per_doc=0)
+    ex = extractor(stub, batch_size=2, concurrency=1, cache_dir=str(tmp_path))
+    asyncio.run(ex.extract_all(ITEMS[:4]))
+    assert len(ex.latencies) == 4
+    # Queueing time for the semaphore is not charged to the second batch
+    assert max(ex.latencies) < 0.09
+    assert ex.run_seconds[-1] >= 0.1
+
+    asyncio.run(ex.extract_all(ITEMS[:4]))
+    assert ex.cache_hits == 4 and len(ex.latencies) == 4
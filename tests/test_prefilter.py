@@ -0,0 +1,23 @@
+from app.prefilter import check_body, check_headers, check_url
+
+ARTICLE = b"<p>" + b"word " * 100 + b"</p>"
+
+
+def test_paywall_class_matches_whole_token_only():
+    assert check_body(b'<div class="article paywall">' + ARTICLE) == "paywall"
+    assert check_body(b'<div class="paywall-container">' + ARTICLE) == "paywall"
+    assert check_body(b'<div class="no-paywall">' + ARTICLE) is None
+    assert check_body(b'<div class="paywall-free">' + ARTICLE) is None
+
+
+def test_json_ld_paywall_and_low_density():
+    assert check_body(b'{"isAccessibleForFree": false}' + ARTICLE) == "paywall"
+    assert check_body(b"<script>" + b"x" * 1000 + b"</script><p>hi</p>") == "low_text_density"
+
+
+def test_url_and_header_checks():
+    assert check_url("https://example.com/report.pdf") == "non_html_extension:.pdf"
+    assert check_url("https://www.youtube.com/watch?v=1") == "video_page"
+    assert check_url("https://example.com/world/story") is None
+    assert check_headers({"Content-Type": "application/pdf"}) == "content_type:application/pdf"
+    assert check_headers({"Content-Type": "text/html; charset=utf-8", "Content-Length": "10"}) is None